@@ -1,6 +1,9 @@
 import pygame
 import sys
 import math
+from collections import namedtuple
+from dataclasses import dataclass
+import numpy as np
 from pygame.locals import *
 
 pygame.init()
@@ -10,6 +13,12 @@ WIDTH, HEIGHT = 800, 600
 screen = pygame.display.set_mode((WIDTH, HEIGHT))
 pygame.display.set_caption("Newton's Cradle Simulation")
 
+# Only mouse input, quit and window repaint requests are handled; SDL drops
+# everything else before it reaches the event queue.
+REPAINT_EVENTS = (VIDEOEXPOSE, WINDOWEXPOSED, WINDOWRESTORED)
+pygame.event.set_blocked(None)
+pygame.event.set_allowed([QUIT, MOUSEBUTTONDOWN, MOUSEBUTTONUP, MOUSEMOTION, *REPAINT_EVENTS])
+
 # Colors
 WHITE    = (255, 255, 255)
 BLACK    = (0, 0, 0)
@@ -17,126 +26,374 @@ GRAY     = (200, 200, 200)
 BLUE     = (50, 100, 200)
 DARK_GRAY = (80, 80, 80)
 
+# Fonts are loaded once here and reused by every frame.
+FONT_SMALL = pygame.font.SysFont(None, 20)
+FONT_MED   = pygame.font.SysFont(None, 24)
+FONT_BIG   = pygame.font.SysFont(None, 36)
+
 # Simulation parameters (damping is fixed to 1.0 for perfect energy conservation)
+@dataclass(slots=True)
 class SimulationParams:
-    def __init__(self):
-        self.num_balls = 5
-        self.ball_radius = 20
-        self.ball_mass = 1.0      # adjustable via slider
-        self.gravity = 50.0       # adjustable via slider
-        self.rod_length = 200
-        self.damping = 1.0        # Set to 1.0 to avoid any energy loss
-        self.initial_angle = math.pi / 4  # initial angle (radians) for the rightmost ball
-        self.time_step = 1/60     # fixed time step (60 FPS)
+    num_balls: int = 5
+    ball_radius: int = 20
+    ball_mass: float = 1.0      # adjustable via slider
+    gravity: float = 50.0       # adjustable via slider
+    rod_length: int = 200
+    damping: float = 1.0        # Set to 1.0 to avoid any energy loss
+    initial_angle: float = math.pi / 4  # initial angle (radians) for the rightmost ball
+    time_step: float = 1/60     # fixed time step (60 FPS)
+
+    # Immutable copy of the values the integrator needs, read once and then
+    # passed explicitly so the physics code never looks at the globals.
+    def physics(self):
+        return Physics(self.time_step, self.gravity, self.rod_length, self.damping)
+
+# Ordered to match the (dt, g, L, damping) arguments of step/advance_state.
+Physics = namedtuple('Physics', 'dt g L damping')
 
 params = SimulationParams()
 
-# Ball class: each ball is a pendulum attached to its pivot.
+# Precision of the simulation state. Single precision is far below the error
+# of a 1/60 s Euler step and halves the memory the kernels stream through;
+# scalars are passed to the kernels in the same type so the arithmetic stays
+# in float32 too. Pivots and ball centers are screen coordinates a few hundred
+# pixels out and stay in double precision. build_kernels.py uses matching
+# signatures.
+STATE_DTYPE = np.float32
+POSITION_DTYPE = np.float64
+
+# Simulation state stored as a Struct-of-Arrays: one NumPy array per quantity,
+# indexed by ball, so the whole cradle can be advanced with a few vector ops.
+@dataclass
+class CradleState:
+    angles: np.ndarray
+    omegas: np.ndarray
+    alphas: np.ndarray  # angular accelerations from the last step
+    pivots_x: np.ndarray  # POSITION_DTYPE
+    pivots_y: np.ndarray
+    masses: np.ndarray
+    xs: np.ndarray  # ball centers (POSITION_DTYPE), refreshed once per frame
+    ys: np.ndarray
+    # sin(angles), reused by the next Euler step; get_positions() refreshes it
+    # after angles are written directly.
+    sins: np.ndarray
+    support_rect: pygame.Rect = None  # bar the pivots hang from, set up once
+
+    @classmethod
+    def empty(cls, n):
+        def zeros(dtype=STATE_DTYPE):
+            return np.zeros(n, dtype=dtype)
+        return cls(zeros(), zeros(), zeros(), zeros(POSITION_DTYPE), zeros(POSITION_DTYPE), zeros(),
+                   zeros(POSITION_DTYPE), zeros(POSITION_DTYPE), zeros())
+
+    def __len__(self):
+        return len(self.angles)
+
+    def __getitem__(self, i):
+        n = len(self.angles)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("ball index out of range")
+        return Ball.view(self, i)
+
+    def __iter__(self):
+        return Ball.views(self)
+
+# Ball class: a thin view onto one entry of a CradleState.
+# A Ball built directly owns a single-element state of its own.
 class Ball:
+    __slots__ = ('_state', '_index')
+
     def __init__(self, mass, initial_angle, pivot):
-        self.mass = mass
+        state = CradleState.empty(1)
+        state.pivots_x[0], state.pivots_y[0] = pivot
+        state.masses[0] = mass
+        self._state = state
+        self._index = 0
         self.angle = initial_angle
-        self.angular_velocity = 0
-        self.angular_acceleration = 0
-        self.pivot = pivot  # (x, y) position of the pivot
-
-    def update(self, dt):
-        # Pendulum dynamics (using a simple symplectic Euler integrator):
-        self.angular_acceleration = -params.gravity * math.sin(self.angle) / params.rod_length
-        self.angular_velocity += self.angular_acceleration * dt
-        # Multiply by damping; here damping is 1.0 so energy is conserved.
-        self.angular_velocity *= params.damping
-        self.angle += self.angular_velocity * dt
+
+    @classmethod
+    def view(cls, state, index):
+        ball = cls.__new__(cls)
+        ball._state = state
+        ball._index = index
+        return ball
+
+    # Views of every ball in a state, yielded lazily so callers that stop
+    # early don't pay for the rest. __new__ is looked up once and the slots
+    # filled inline instead of going through view() for each ball.
+    @classmethod
+    def views(cls, state):
+        new = cls.__new__
+        for i in range(len(state.angles)):
+            ball = new(cls)
+            ball._state = state
+            ball._index = i
+            yield ball
+
+    @property
+    def mass(self):
+        return float(self._state.masses[self._index])
+
+    @property
+    def angle(self):
+        return float(self._state.angles[self._index])
+
+    # Setting the angle also refreshes the cached sine and ball center, so
+    # readers can use x / y without recomputing them.
+    @angle.setter
+    def angle(self, value):
+        self._set_angle(value, params.rod_length)
+
+    # The angle setter with an explicit rod length, for callers (like update)
+    # that were handed L instead of reading params.
+    def _set_angle(self, value, L):
+        state, i = self._state, self._index
+        sin = math.sin(value)
+        state.angles[i] = value
+        state.sins[i] = sin
+        state.xs[i] = state.pivots_x[i] + L * sin
+        state.ys[i] = state.pivots_y[i] + L * math.cos(value)
+
+    @property
+    def x(self):
+        return float(self._state.xs[self._index])
+
+    @property
+    def y(self):
+        return float(self._state.ys[self._index])
+
+    @property
+    def angular_velocity(self):
+        return float(self._state.omegas[self._index])
+
+    @angular_velocity.setter
+    def angular_velocity(self, value):
+        self._state.omegas[self._index] = value
+
+    @property
+    def angular_acceleration(self):
+        return float(self._state.alphas[self._index])
+
+    @angular_acceleration.setter
+    def angular_acceleration(self, value):
+        self._state.alphas[self._index] = value
+
+    @property
+    def pivot(self):
+        return (float(self._state.pivots_x[self._index]), float(self._state.pivots_y[self._index]))
+
+    def update(self, dt, g, L, damping):
+        # Pendulum dynamics (using a simple symplectic Euler integrator).
+        # Works on locals and the state arrays directly rather than going
+        # through the properties for every read and write. sin(angle) was
+        # cached by the angle setter, which also refreshes it (and the
+        # position) after the step below.
+        state, i = self._state, self._index
+        alpha = -g * float(state.sins[i]) / L
+        state.alphas[i] = alpha
+        omega = float(state.omegas[i]) + alpha * dt
+        # Multiply by damping; the default of 1.0 conserves energy and makes
+        # this a no-op.
+        if damping != 1.0:
+            omega *= damping
+        state.omegas[i] = omega
+        self._set_angle(float(state.angles[i]) + omega * dt, L)
 
     def get_position(self):
-        # Compute ball center from its pivot and current angle.
-        x = self.pivot[0] + params.rod_length * math.sin(self.angle)
-        y = self.pivot[1] + params.rod_length * math.cos(self.angle)
-        return (x, y)
+        # Ball center, kept up to date whenever the angle changes.
+        return (self.x, self.y)
+
+# Collision tuning shared by the Python and compiled code paths.
+COLLISION_TOLERANCE = 1.0  # extra pixels allowed for contact
+
+# Physics kernels: the ahead-of-time build produced by build_kernels.py when
+# it is present, otherwise the Numba JIT versions from physics_kernels.py.
+try:
+    from cradle_kernels import (euler_kernel, positions_kernel, sync_kernel, collision_kernel,
+                                advance, advance_steps)
+
+    # The ahead-of-time build only carries the serial kernel.
+    def advance_for(num_balls):
+        return advance
+except ImportError:
+    from physics_kernels import (euler_kernel, positions_kernel, sync_kernel, collision_kernel,
+                                 advance, advance_steps, advance_for)
+
+# Advance the cradle by `steps` full steps of dt (update, positions and
+# collisions each time), all inside compiled code. main() takes one step per
+# frame; steps > 1 is for callers that split a frame into sub-steps.
+def advance_state(state, dt, g, L, damping, radius, steps=1):
+    args = (state.angles, state.omegas, state.alphas, state.sins, state.pivots_x, state.pivots_y,
+            state.xs, state.ys, STATE_DTYPE(dt), STATE_DTYPE(g), STATE_DTYPE(L),
+            STATE_DTYPE(damping), STATE_DTYPE(radius), STATE_DTYPE(COLLISION_TOLERANCE))
+    if steps == 1:
+        advance_for(len(state))(*args)  # threaded variant for large cradles
+    else:
+        advance_steps(*args, steps)
+    # The kernels run with fastmath, which assumes finite values, so catch a
+    # blow-up here rather than let NaNs spread. Stripped under python -O.
+    # A sum is finite only if every term is (an overflow means a blow-up
+    # too), so this needs no per-ball temporary arrays. NumPy's warnings for
+    # that inf/NaN arithmetic are silenced; the assert is the report.
+    if __debug__:
+        with np.errstate(invalid='ignore', over='ignore'):
+            finite = math.isfinite(state.angles.sum() + state.omegas.sum())
+        assert finite, "simulation state is no longer finite"
+
+# Compile the kernels up front so the first frame doesn't pay for it (a no-op
+# cost when the ahead-of-time build is in use).
+def warm_up_kernels():
+    state = CradleState.empty(2)
+    state.pivots_x[1] = 40.0
+    advance_state(state, 1 / 60, 50.0, 200.0, 1.0, 20.0)
+
+# Advance every pendulum by one symplectic Euler step.
+def step(state, dt, g, L, damping):
+    euler_kernel(state.angles, state.omegas, state.alphas, state.sins, STATE_DTYPE(dt),
+                 STATE_DTYPE(g), STATE_DTYPE(L), STATE_DTYPE(damping))
+
+# Refresh the cached sines and ball centers for the whole cradle.
+def get_positions(state, L):
+    sync_kernel(state.angles, state.sins, state.pivots_x, state.pivots_y, STATE_DTYPE(L),
+                state.xs, state.ys)
+    return state.xs, state.ys
 
 # Initialize balls along a horizontal support.
 # All balls start at equilibrium (angle = 0) except the rightmost, which is raised.
+# The state comes back with sines and ball centers already computed.
 def initialize_simulation():
-    balls = []
+    n = params.num_balls
     origin_x = WIDTH // 2
     origin_y = 100  # y-coordinate of the support (pivots)
     spacing = 2 * params.ball_radius  # spacing so balls just touch at equilibrium
-    start_x = origin_x - ((params.num_balls - 1) / 2) * spacing
-    for i in range(params.num_balls):
-        initial_angle = params.initial_angle if i == params.num_balls - 1 else 0
-        pivot = (start_x + i * spacing, origin_y)
-        balls.append(Ball(params.ball_mass, initial_angle, pivot))
-    return balls
-
-# Iterative collision resolution that swaps angular velocities.
+    start_x = origin_x - ((n - 1) / 2) * spacing
+    state = CradleState.empty(n)
+    state.pivots_x[:] = start_x + np.arange(n) * spacing
+    state.pivots_y[:] = origin_y
+    state.masses[:] = params.ball_mass
+    if n > 0:
+        state.angles[-1] = params.initial_angle
+        left_pivot, right_pivot = state.pivots_x[0], state.pivots_x[-1]
+        state.support_rect = pygame.Rect(left_pivot - 20, origin_y - 10, (right_pivot - left_pivot) + 40, 10)
+    get_positions(state, params.rod_length)
+    return state
+
+# Collision resolution that swaps angular velocities.
 # For equal masses, this is energy-conserving.
+# Accepts a CradleState or a plain list of Balls.
 def resolve_collisions(balls):
-    tolerance = 1.0  # extra pixels allowed for contact
-    max_iter = 10    # maximum iterations per frame
-    n = len(balls)
-    for _ in range(max_iter):
-        collision_found = False
-        # Loop over adjacent pairs (from rightmost to leftmost).
-        for i in range(n - 1, 0, -1):
-            ball_right = balls[i]
-            ball_left  = balls[i - 1]
-            pos_right = ball_right.get_position()
-            pos_left  = ball_left.get_position()
-            dx = pos_right[0] - pos_left[0]
-            if dx < 2 * params.ball_radius + tolerance:
-                # Approximate horizontal velocity: v ~ L * ω  (assuming small angles so cos(angle) ~ 1)
-                v_right = params.rod_length * ball_right.angular_velocity
-                v_left  = params.rod_length * ball_left.angular_velocity
-                # If the relative velocity is negative (right ball moving toward left ball), swap velocities.
-                if (v_right - v_left) < 0:
-                    ball_left.angular_velocity, ball_right.angular_velocity = ball_right.angular_velocity, ball_left.angular_velocity
-                    collision_found = True
-        if not collision_found:
-            break
-
-# Draw the support bar, rods, and balls.
-def draw(screen, balls):
-    screen.fill(WHITE)
-    if balls:
-        left_pivot = balls[0].pivot[0]
-        right_pivot = balls[-1].pivot[0]
-        origin_y = balls[0].pivot[1]
-        support_rect = (left_pivot - 20, origin_y - 10, (right_pivot - left_pivot) + 40, 10)
-        pygame.draw.rect(screen, DARK_GRAY, support_rect)
-    for ball in balls:
-        ball_pos = ball.get_position()
-        pygame.draw.line(screen, GRAY, ball.pivot, ball_pos, 2)
-        pygame.draw.circle(screen, BLUE, (int(ball_pos[0]), int(ball_pos[1])), params.ball_radius)
-        pygame.draw.circle(screen, BLACK, (int(ball_pos[0]), int(ball_pos[1])), params.ball_radius, 1)
+    if isinstance(balls, CradleState):
+        state = balls
+        # Recompute sines and centers: callers may have written the angles
+        # directly. The frame loop uses the fused kernel instead.
+        get_positions(state, params.rod_length)
+    else:
+        xs = [ball.x for ball in balls]
+        # Same contact distance as the kernel computes (in float32). With no
+        # pair close enough to touch there is nothing to swap, so skip the
+        # scratch state and the write-back.
+        contact = float(2 * STATE_DTYPE(params.ball_radius) + STATE_DTYPE(COLLISION_TOLERANCE))
+        if all(right - left >= contact for left, right in zip(xs, xs[1:])):
+            return
+        state = CradleState.empty(len(balls))
+        state.omegas[:] = [ball.angular_velocity for ball in balls]
+        state.xs[:] = xs
+    collision_kernel(state.xs, state.omegas, STATE_DTYPE(params.ball_radius),
+                     STATE_DTYPE(COLLISION_TOLERANCE))
+    if state is not balls:
+        for ball, omega in zip(balls, state.omegas):
+            ball.angular_velocity = omega
+
+# Pre-rendered ball images (fill + outline), one per radius, so drawing a ball
+# is a single blit instead of two circle rasterizations.
+_ball_sprites = {}
+
+def get_ball_sprite(radius):
+    sprite = _ball_sprites.get(radius)
+    if sprite is None:
+        size = 2 * int(radius) + 2
+        center = (size // 2, size // 2)
+        sprite = pygame.Surface((size, size), SRCALPHA).convert_alpha()
+        pygame.draw.circle(sprite, BLUE, center, radius)
+        pygame.draw.circle(sprite, BLACK, center, radius, 1)
+        _ball_sprites[radius] = sprite
+    return sprite
+
+# Draw the support bar, rods, and balls on top of the background, using the
+# positions cached on the state.
+# Returns the screen area that was touched, for partial display updates.
+def draw(screen, state):
+    xs, ys = state.xs, state.ys
+    if not len(state):
+        return pygame.Rect(0, 0, 0, 0)
+    support_rect = state.support_rect
+    # Lock once for all the primitive draws instead of once per call; the
+    # surface has to be unlocked again before blitting the balls.
+    screen.lock()
+    pygame.draw.rect(screen, DARK_GRAY, support_rect)
+    for i in range(len(state)):
+        pygame.draw.line(screen, GRAY, (state.pivots_x[i], state.pivots_y[i]), (xs[i], ys[i]), 2)
+    screen.unlock()
+    sprite = get_ball_sprite(params.ball_radius)
+    offset = sprite.get_width() // 2
+    # One blits() call, and no per-ball Rect returned.
+    screen.blits([(sprite, (int(x) - offset, int(y) - offset)) for x, y in zip(xs, ys)], False)
+    margin = params.ball_radius + 2
+    left = min(xs.min() - margin, support_rect.left)
+    top = min(ys.min() - margin, support_rect.top)
+    right = max(xs.max() + margin, support_rect.right)
+    bottom = max(ys.max() + margin, support_rect.bottom)
+    return pygame.Rect(left, top, right - left, bottom - top)
 
 # UI Elements: Button and Slider classes.
+# Their event handlers take the event fields (etype, button, pos), unpacked
+# once per event by the main loop.
+_MBDOWN = pygame.MOUSEBUTTONDOWN
+
 class Button:
+    __slots__ = ('rect', 'text', 'color', 'hover_color', 'active_color', '_text_surf', '_text_rect')
+
     def __init__(self, x, y, width, height, text, color=(100, 100, 200)):
         self.rect = pygame.Rect(x, y, width, height)
         self.text = text
         self.color = color
-        self.hover_color = (min(color[0] + 30, 255),
-                            min(color[1] + 30, 255),
-                            min(color[2] + 30, 255))
+        self.hover_color = tuple(min(c + 30, 255) for c in color)
         self.active_color = color
+        # The caption never changes, so render and center it once.
+        self._text_surf = FONT_MED.render(self.text, True, WHITE)
+        self._text_rect = self._text_surf.get_rect(center=self.rect.center)
+
+    def draw_body(self, screen, color):
+        pygame.draw.rect(screen, color, self.rect, border_radius=5)
+        screen.blit(self._text_surf, self._text_rect)
 
     def draw(self, screen):
         mouse_pos = pygame.mouse.get_pos()
         if self.rect.collidepoint(mouse_pos):
-            pygame.draw.rect(screen, self.hover_color, self.rect, border_radius=5)
+            self.draw_body(screen, self.hover_color)
         else:
-            pygame.draw.rect(screen, self.active_color, self.rect, border_radius=5)
-        font = pygame.font.SysFont(None, 24)
-        text_surf = font.render(self.text, True, WHITE)
-        text_rect = text_surf.get_rect(center=self.rect.center)
-        screen.blit(text_surf, text_rect)
-
-    def is_clicked(self, event):
-        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-            return self.rect.collidepoint(event.pos)
+            self.draw_body(screen, self.active_color)
+
+    # Overlay for the cached background, which already holds the normal state.
+    def draw_hover(self, screen):
+        if self.rect.collidepoint(pygame.mouse.get_pos()):
+            self.draw_body(screen, self.hover_color)
+
+    def is_clicked(self, etype, button, pos):
+        if etype == _MBDOWN and button == 1:
+            # Edges read from the live rect (right and bottom exclusive, like
+            # Rect), so a moved button stays clickable where it is drawn.
+            x, y = pos
+            rect = self.rect
+            return rect.left <= x < rect.right and rect.top <= y < rect.bottom
         return False
 
 class Slider:
+    __slots__ = ('rect', 'min_val', 'max_val', '_value', 'label', 'step', 'active',
+                 'handle_radius', '_label_key', '_label_surf', '_handle_rect', '_handle_track')
+
     def __init__(self, x, y, width, height, min_val, max_val, initial_val, label, step=1):
         self.rect = pygame.Rect(x, y, width, height)
         self.min_val = min_val
@@ -146,34 +403,67 @@ class Slider:
         self.step = step
         self.active = False
         self.handle_radius = 10
+        self._label_key = None   # value the cached label was rendered for
+        self._label_surf = None
+        self._handle_track = None  # track rect the cached handle was placed on
+
+    @property
+    def value(self):
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        self._value = value
+        self._handle_rect = None  # handle moved; recomputed on next use
+
+    # Bounding box of the handle circle, cached until the value or the track
+    # rect changes. Everything else is read from the live rect, so a moved
+    # slider is drawn and dragged where it is, like Button.
+    def handle_rect(self):
+        if self._handle_rect is None or self._handle_track != self.rect:
+            handle_x = self.rect.x + (self._value - self.min_val) / (self.max_val - self.min_val) * self.rect.width
+            handle_y = self.rect.y + self.rect.height // 2
+            self._handle_rect = pygame.Rect(handle_x - self.handle_radius, handle_y - self.handle_radius,
+                                            2 * self.handle_radius, 2 * self.handle_radius)
+            self._handle_track = self.rect.copy()
+        return self._handle_rect
+
+    # Screen area covered by the track and the handle at any value.
+    def handle_area(self):
+        return self.rect.inflate(2 * self.handle_radius + 2, 2 * self.handle_radius + 2)
 
     def draw(self, screen):
+        self.draw_track(screen)
+        self.draw_handle(screen)
+
+    def draw_handle(self, screen):
+        pygame.draw.circle(screen, BLUE, self.handle_rect().center, self.handle_radius)
+
+    # Returns the area covered by the track and its label.
+    def draw_track(self, screen):
         pygame.draw.rect(screen, GRAY, self.rect, border_radius=3)
-        handle_x = self.rect.x + (self.value - self.min_val) / (self.max_val - self.min_val) * self.rect.width
-        handle_y = self.rect.y + self.rect.height // 2
-        pygame.draw.circle(screen, BLUE, (int(handle_x), int(handle_y)), self.handle_radius)
-        font = pygame.font.SysFont(None, 20)
-        label_surf = font.render(f"{self.label}: {self.value:.2f}", True, BLACK)
-        label_rect = label_surf.get_rect(x=self.rect.x, y=self.rect.y - 25)
-        screen.blit(label_surf, label_rect)
-
-    def handle_event(self, event):
-        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-            handle_x = self.rect.x + (self.value - self.min_val) / (self.max_val - self.min_val) * self.rect.width
-            handle_y = self.rect.y + self.rect.height // 2
-            handle_rect = pygame.Rect(handle_x - self.handle_radius, handle_y - self.handle_radius,
-                                      2 * self.handle_radius, 2 * self.handle_radius)
-            if handle_rect.collidepoint(event.pos):
+        # The label only changes while the slider is dragged, so re-render it on change.
+        label_key = round(self.value, 2)
+        if label_key != self._label_key:
+            self._label_surf = FONT_SMALL.render(f"{self.label}: {self.value:.2f}", True, BLACK)
+            self._label_key = label_key
+        return self.rect.union(screen.blit(self._label_surf, (self.rect.x, self.rect.y - 25)))
+
+    def handle_event(self, etype, button, pos):
+        if etype == pygame.MOUSEBUTTONDOWN and button == 1:
+            if self.handle_rect().collidepoint(pos):
                 self.active = True
-        elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+        elif etype == pygame.MOUSEBUTTONUP and button == 1:
             self.active = False
-        elif event.type == pygame.MOUSEMOTION and self.active:
-            rel_x = max(0, min(event.pos[0] - self.rect.x, self.rect.width))
-            self.value = self.min_val + (self.max_val - self.min_val) * rel_x / self.rect.width
+        elif etype == pygame.MOUSEMOTION and self.active:
+            rel_x = max(0, min(pos[0] - self.rect.x, self.rect.width))
+            value = self.min_val + (self.max_val - self.min_val) * rel_x / self.rect.width
             if self.step != 0:
-                self.value = round(self.value / self.step) * self.step
-            self.value = max(self.min_val, min(self.max_val, self.value))
-            return True
+                value = round(value / self.step) * self.step
+            old_value = self._value
+            self.value = max(self.min_val, min(self.max_val, value))
+            # Only a changed value needs the overlay (and its label) rebuilt.
+            return self._value != old_value
         return False
 
 # Create UI elements.
@@ -189,21 +479,71 @@ sliders = [
     Slider(400, HEIGHT - 160, 300, 10, 0.9, 1, params.damping, "Damping", 0.001),
     Slider(400, HEIGHT - 120, 300, 10, 0, math.pi/2, params.initial_angle, "Initial Angle (rad)", 0.01)
 ]
+buttons = [start_button, reset_button]
+
+# Render the UI that doesn't move (title, button bodies, slider tracks and
+# labels) once onto a transparent overlay. Frames draw the cradle first and
+# then blit the overlay back over it, so the UI stays on top of the balls.
+# Returns the overlay and the areas it covers.
+def build_ui_overlay():
+    overlay = pygame.Surface((WIDTH, HEIGHT), SRCALPHA).convert_alpha()
+    overlay.fill((0, 0, 0, 0))
+    title_surf = FONT_BIG.render("Newton's Cradle Simulation", True, BLACK)
+    title_rect = title_surf.get_rect(center=(WIDTH//2, 40))
+    rects = [overlay.blit(title_surf, title_rect)]
+    for button in buttons:
+        button.draw_body(overlay, button.active_color)
+        rects.append(button.rect)
+    for slider in sliders:
+        rects.append(slider.draw_track(overlay))
+    return overlay, rects
 
 # Main loop.
 def main():
     clock = pygame.time.Clock()
     running = True
     simulation_running = False
-    balls = initialize_simulation()
+    warm_up_kernels()
+    state = initialize_simulation()
+    physics = params.physics()  # params only change on Reset
+    full_redraw = True
+    dirty = True  # something on screen may have changed since the last frame
+    prev_cradle_rect = pygame.Rect(0, 0, WIDTH, HEIGHT)
+    # Areas pushed to the display on partial updates; the first two slots
+    # hold this frame's and last frame's cradle area, the rest are filled in
+    # whenever the overlay is rebuilt.
+    ui_rects = [None, None]
+    active_slider = None  # slider being dragged, if any
     
     while running:
         for event in pygame.event.get():
-            if event.type == pygame.QUIT:
+            # Any input can change hover/slider/button state, so repaint.
+            dirty = True
+            # Read the event's fields once; the widgets take them as arguments.
+            etype = event.type
+            mouse_button = getattr(event, 'button', 0)
+            pos = getattr(event, 'pos', None)
+            if etype in REPAINT_EVENTS:
+                # The window was uncovered or restored: push the whole frame,
+                # since partial updates would leave the rest blank.
+                full_redraw = True
+                continue
+            if etype == pygame.MOUSEMOTION:
+                # Hover is read at draw time; only a dragged slider handles motion.
+                if active_slider is not None and active_slider.handle_event(etype, mouse_button, pos):
+                    full_redraw = True
+                continue
+            if etype == pygame.MOUSEBUTTONUP:
+                if active_slider is not None:
+                    active_slider.handle_event(etype, mouse_button, pos)
+                    if not active_slider.active:
+                        active_slider = None
+                continue
+            if etype == pygame.QUIT:
                 running = False
-            if start_button.is_clicked(event):
+            if start_button.is_clicked(etype, mouse_button, pos):
                 simulation_running = not simulation_running
-            if reset_button.is_clicked(event):
+            if reset_button.is_clicked(etype, mouse_button, pos):
                 params.num_balls    = int(sliders[0].value)
                 params.ball_radius  = sliders[1].value
                 params.gravity      = sliders[2].value
@@ -211,28 +551,50 @@ def main():
                 params.ball_mass    = sliders[4].value
                 params.damping      = sliders[5].value  # For perfect conservation, set to 1.0.
                 params.initial_angle = sliders[6].value
-                balls = initialize_simulation()
+                state = initialize_simulation()
+                physics = params.physics()
                 simulation_running = False
-            for slider in sliders:
-                slider.handle_event(event)
+                full_redraw = True
+            if etype == pygame.MOUSEBUTTONDOWN and active_slider is None:
+                for slider in sliders:
+                    slider.handle_event(etype, mouse_button, pos)
+                    if slider.active:
+                        active_slider = slider
+                        break
+        if full_redraw:
+            overlay, overlay_rects = build_ui_overlay()
+            overlay_blits = [(overlay, rect, rect) for rect in overlay_rects]
+            ui_rects[2:] = [slider.handle_area() for slider in sliders]
+            ui_rects += overlay_rects
         
         if simulation_running:
-            for ball in balls:
-                ball.update(params.time_step)
-            resolve_collisions(balls)
+            advance_state(state, *physics, params.ball_radius)
+            dirty = True
         
-        draw(screen, balls)
-        start_button.draw(screen)
-        reset_button.draw(screen)
-        for slider in sliders:
-            slider.draw(screen)
+        # Paused with no input: nothing to repaint, so just poll at a low rate.
+        if not dirty:
+            clock.tick(10)
+            continue
         
-        font = pygame.font.SysFont(None, 36)
-        title_surf = font.render("Newton's Cradle Simulation", True, BLACK)
-        title_rect = title_surf.get_rect(center=(WIDTH//2, 40))
-        screen.blit(title_surf, title_rect)
+        screen.fill(WHITE)
+        cradle_rect = draw(screen, state)
+        screen.blits(overlay_blits, False)
+        for button in buttons:
+            button.draw_hover(screen)
+        for slider in sliders:
+            slider.draw_handle(screen)
         
-        pygame.display.flip()
+        if full_redraw:
+            pygame.display.flip()
+            full_redraw = False
+        else:
+            # Only push the areas that can change between frames; the old cradle
+            # area is included so last frame's balls get erased.
+            ui_rects[0] = cradle_rect
+            ui_rects[1] = prev_cradle_rect
+            pygame.display.update(ui_rects)
+        prev_cradle_rect = cradle_rect
+        dirty = False
         clock.tick(60)
     
     pygame.quit()
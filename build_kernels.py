@@ -0,0 +1,35 @@
+# Ahead-of-time build of the physics kernels.
+# Running this script compiles the functions in physics_kernels.py into a
+# native extension module (cradle_kernels) next to this file. NewtonCradle.py
+# imports that module when it exists, so the simulation starts without any
+# JIT compilation; without it the JIT versions are used instead.
+#
+# Usage:
+#   python build_kernels.py
+import os
+from numba.pycc import CC
+
+import physics_kernels
+
+# Must match STATE_DTYPE (float32) and POSITION_DTYPE (float64) in NewtonCradle.py.
+ARRAY = "f4[::1]"
+POSITIONS = "f8[::1]"
+# angles, sins, pivots_x, pivots_y, L, xs, ys
+POSITIONS_SIGNATURE = f"void({ARRAY}, {ARRAY}, {POSITIONS}, {POSITIONS}, f4, {POSITIONS}, {POSITIONS})"
+
+cc = CC("cradle_kernels")
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+cc.export("euler_kernel", f"void({', '.join([ARRAY] * 4)}, f4, f4, f4, f4)")(
+    physics_kernels.euler_kernel.py_func)
+cc.export("positions_kernel", POSITIONS_SIGNATURE)(physics_kernels.positions_kernel.py_func)
+cc.export("sync_kernel", POSITIONS_SIGNATURE)(physics_kernels.sync_kernel.py_func)
+cc.export("collision_kernel", f"void({POSITIONS}, {ARRAY}, f4, f4)")(
+    physics_kernels.collision_kernel.py_func)
+cc.export("advance", f"void({', '.join([ARRAY] * 4)}, {', '.join([POSITIONS] * 4)}, f4, f4, f4, f4, f4, f4)")(
+    physics_kernels.advance.py_func)
+cc.export("advance_steps", f"void({', '.join([ARRAY] * 4)}, {', '.join([POSITIONS] * 4)}, f4, f4, f4, f4, f4, f4, i8)")(
+    physics_kernels.advance_steps.py_func)
+
+if __name__ == "__main__":
+    cc.compile()
@@ -0,0 +1,107 @@
+# Numba kernels for the Newton's Cradle simulation.
+# They only touch NumPy arrays and scalars, so Numba can run them in
+# nopython mode; cache=True keeps the machine code between runs.
+# build_kernels.py compiles the same functions ahead of time.
+import math
+from numba import njit, prange
+
+# The Euler update reads sin(angle) cached by the previous step (or by
+# get_positions) instead of recomputing it, and leaves sin of the new angle
+# behind for the positions pass and the next step.
+@njit(fastmath=True)
+def _euler_ball(i, angles, omegas, alphas, sins, dt, g, L, damping):
+    # Pendulum dynamics (symplectic Euler) for ball i.
+    alphas[i] = -g * sins[i] / L
+    omegas[i] = (omegas[i] + alphas[i] * dt) * damping
+    angles[i] += omegas[i] * dt
+    sins[i] = math.sin(angles[i])
+
+@njit(fastmath=True)
+def _position_ball(i, angles, sins, pivots_x, pivots_y, L, xs, ys):
+    xs[i] = pivots_x[i] + L * sins[i]
+    ys[i] = pivots_y[i] + L * math.cos(angles[i])
+
+@njit(fastmath=True)
+def _euler(angles, omegas, alphas, sins, dt, g, L, damping):
+    for i in range(angles.shape[0]):
+        _euler_ball(i, angles, omegas, alphas, sins, dt, g, L, damping)
+
+@njit(fastmath=True)
+def _positions(angles, sins, pivots_x, pivots_y, L, xs, ys):
+    for i in range(angles.shape[0]):
+        _position_ball(i, angles, sins, pivots_x, pivots_y, L, xs, ys)
+
+# Angles don't change while velocities are swapped, so contacts are fixed for
+# the whole call and repeated right-to-left passes just bubble-sort the angular
+# velocities of each run of touching balls into ascending order. A single
+# insertion-sort sweep reaches that same end state directly.
+@njit(fastmath=True)
+def _collisions(xs, omegas, radius, tol):
+    contact = 2 * radius + tol
+    for i in range(1, xs.shape[0]):
+        j = i
+        # Swap while in contact and the right ball is moving toward the left one.
+        while j > 0 and xs[j] - xs[j - 1] < contact and omegas[j] < omegas[j - 1]:
+            tmp = omegas[j]
+            omegas[j] = omegas[j - 1]
+            omegas[j - 1] = tmp
+            j -= 1
+
+@njit(cache=True, fastmath=True)
+def euler_kernel(angles, omegas, alphas, sins, dt, g, L, damping):
+    _euler(angles, omegas, alphas, sins, dt, g, L, damping)
+
+@njit(cache=True, fastmath=True)
+def positions_kernel(angles, sins, pivots_x, pivots_y, L, xs, ys):
+    _positions(angles, sins, pivots_x, pivots_y, L, xs, ys)
+
+# Recompute the cached sines (after angles were written directly), then the
+# positions.
+@njit(cache=True, fastmath=True)
+def sync_kernel(angles, sins, pivots_x, pivots_y, L, xs, ys):
+    for i in range(angles.shape[0]):
+        sins[i] = math.sin(angles[i])
+    _positions(angles, sins, pivots_x, pivots_y, L, xs, ys)
+
+@njit(cache=True, fastmath=True)
+def collision_kernel(xs, omegas, radius, tol):
+    _collisions(xs, omegas, radius, tol)
+
+# One full simulation step: pendulum update, ball positions (kept for drawing)
+# and collision resolution, all in a single compiled call. With the cached
+# sines each ball costs one sin and one cos per frame.
+@njit(cache=True, fastmath=True)
+def advance(angles, omegas, alphas, sins, pivots_x, pivots_y, xs, ys, dt, g, L, damping, radius, tol):
+    _euler(angles, omegas, alphas, sins, dt, g, L, damping)
+    _positions(angles, sins, pivots_x, pivots_y, L, xs, ys)
+    _collisions(xs, omegas, radius, tol)
+
+# n_steps consecutive calls of advance in one compiled loop, so a frame can be
+# split into smaller sub-steps without paying the call overhead for each.
+@njit(cache=True, fastmath=True)
+def advance_steps(angles, omegas, alphas, sins, pivots_x, pivots_y, xs, ys, dt, g, L, damping, radius, tol,
+                  n_steps):
+    for _ in range(n_steps):
+        _euler(angles, omegas, alphas, sins, dt, g, L, damping)
+        _positions(angles, sins, pivots_x, pivots_y, L, xs, ys)
+        _collisions(xs, omegas, radius, tol)
+
+# For large cradles the per-ball update and positions are independent, so
+# they are spread over threads with prange; collisions stay serial since each
+# swap depends on the previous one. Below PARALLEL_MIN_BALLS the thread
+# launch costs more than it saves (the whole serial step takes only a few
+# microseconds at a few hundred balls).
+PARALLEL_MIN_BALLS = 512
+
+@njit(parallel=True, cache=True, fastmath=True)
+def advance_parallel(angles, omegas, alphas, sins, pivots_x, pivots_y, xs, ys, dt, g, L, damping, radius, tol):
+    n = angles.shape[0]
+    for i in prange(n):
+        _euler_ball(i, angles, omegas, alphas, sins, dt, g, L, damping)
+        _position_ball(i, angles, sins, pivots_x, pivots_y, L, xs, ys)
+    _collisions(xs, omegas, radius, tol)
+
+def advance_for(num_balls):
+    if num_balls > PARALLEL_MIN_BALLS:
+        return advance_parallel
+    return advance
@@ -11,9 +11,13 @@ from NewtonCradle import (
 class TestSimulationIntegration(unittest.TestCase):
     """Integration tests for the Newton's Cradle simulation"""
 
+    @classmethod
+    def setUpClass(cls):
+        """Initialize pygame once for the whole class"""
+        pygame.init()
+
     def setUp(self):
         """Set up test fixtures"""
-        pygame.init()
         self.params = SimulationParams()
 
     def test_full_simulation_initialization(self):
@@ -39,7 +43,7 @@ class TestSimulationIntegration(unittest.TestCase):
             # Run simulation for several steps
             for _ in range(100):
                 for ball in balls:
-                    ball.update(self.params.time_step)
+                    ball.update(*self.params.physics())
                 resolve_collisions(balls)
 
             # After simulation, leftmost balls should have gained energy
@@ -61,7 +65,7 @@ class TestSimulationIntegration(unittest.TestCase):
 
             # Run simulation to capture oscillation
             for _ in range(120):  # 2 seconds at 60 FPS
-                ball.update(self.params.time_step)
+                ball.update(*self.params.physics())
                 angles.append(ball.angle)
 
             # Ball should oscillate (angle should cross zero)
@@ -142,7 +146,7 @@ class TestSimulationIntegration(unittest.TestCase):
 
             # Run simulation for one complete period
             for _ in range(200):
-                ball.update(self.params.time_step)
+                ball.update(*self.params.physics())
 
             # Calculate final energy
             height = self.params.rod_length * (1 - math.cos(ball.angle))
@@ -168,7 +172,7 @@ class TestSimulationIntegration(unittest.TestCase):
 
             # Run simulation for many steps
             for _ in range(500):
-                ball.update(self.params.time_step)
+                ball.update(*self.params.physics())
 
             # Maximum angle should decrease due to damping
             # Note: we need to track max angle over time
@@ -177,7 +181,7 @@ class TestSimulationIntegration(unittest.TestCase):
             balls = initialize_simulation()
             ball = balls[0]
             for _ in range(500):
-                ball.update(self.params.time_step)
+                ball.update(*self.params.physics())
                 max_angle_seen = max(max_angle_seen, abs(ball.angle))
 
             # After many oscillations with damping, the max angle should be less
@@ -202,7 +206,7 @@ class TestSimulationIntegration(unittest.TestCase):
             # Simulation should still run without errors
             for _ in range(10):
                 for ball in balls:
-                    ball.update(self.params.time_step)
+                    ball.update(*self.params.physics())
                 resolve_collisions(balls)
 
             # Test passes if no exceptions were raised
@@ -222,7 +226,7 @@ class TestSimulationIntegration(unittest.TestCase):
             # Run simulation - should handle extreme angles
             for _ in range(50):
                 for ball in balls:
-                    ball.update(self.params.time_step)
+                    ball.update(*self.params.physics())
                 resolve_collisions(balls)
 
             # Test passes if no exceptions were raised
@@ -242,7 +246,7 @@ class TestSimulationIntegration(unittest.TestCase):
             # Run simulation
             for _ in range(100):
                 for ball in balls:
-                    ball.update(self.params.time_step)
+                    ball.update(*self.params.physics())
                 resolve_collisions(balls)
 
             # Verify all balls are still valid
@@ -277,7 +281,7 @@ class TestPhysicsAccuracy(unittest.TestCase):
             prev_angle = ball.angle
 
             for i in range(500):
-                ball.update(self.params.time_step)
+                ball.update(*self.params.physics())
                 time += self.params.time_step
 
                 # Detect zero crossing
@@ -301,7 +305,7 @@ class TestPhysicsAccuracy(unittest.TestCase):
             # Run simulation for extended time
             for _ in range(1000):
                 for ball in balls:
-                    ball.update(self.params.time_step)
+                    ball.update(*self.params.physics())
                 resolve_collisions(balls)
 
             # Verify no NaN or Inf values
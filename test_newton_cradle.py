@@ -1,16 +1,26 @@
 import unittest
+import inspect
 import math
+import random
 import sys
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import patch
+import numpy as np
 import pygame
 
 # Import classes and functions from the main file
+import NewtonCradle
 from NewtonCradle import (
-    SimulationParams, Ball, Button, Slider,
-    initialize_simulation, resolve_collisions
+    SimulationParams, Ball, Button, Slider, CradleState,
+    initialize_simulation, resolve_collisions, step, get_positions, advance_state,
+    draw, build_ui_overlay, get_ball_sprite, WIDTH, HEIGHT
 )
 
 
+# Event fields in the (etype, button, pos) order the widget handlers take.
+def mk_event(type, button=1, pos=(0, 0)):
+    return (type, button, pos)
+
+
 class TestSimulationParams(unittest.TestCase):
     """Test cases for the SimulationParams class"""
 
@@ -37,6 +47,23 @@ class TestSimulationParams(unittest.TestCase):
         self.assertEqual(params.gravity, 100.0)
         self.assertEqual(params.damping, 0.95)
 
+    def test_unknown_parameter_rejected(self):
+        """Test that a misspelled parameter raises instead of being ignored"""
+        params = SimulationParams()
+        with self.assertRaises(AttributeError):
+            params.gravitiy = 10.0
+
+    def test_physics_snapshot(self):
+        """Test that physics() copies the integrator values and stays fixed"""
+        params = SimulationParams()
+        physics = params.physics()
+        self.assertEqual(tuple(physics), (params.time_step, params.gravity,
+                                          params.rod_length, params.damping))
+        params.gravity = 100.0
+        self.assertEqual(physics.g, 50.0)
+        with self.assertRaises(AttributeError):
+            physics.g = 100.0
+
 
 class TestBall(unittest.TestCase):
     """Test cases for the Ball class (pendulum physics)"""
@@ -48,6 +75,10 @@ class TestBall(unittest.TestCase):
         self.initial_angle = 0
         self.mass = 1.0
 
+    def close(self, a, b, tol=5e-6):
+        """Assert that a and b agree to within tol (5e-6 matches places=5)"""
+        self.assertTrue(math.isclose(a, b, rel_tol=0, abs_tol=tol), f"{a} !~ {b}")
+
     def test_ball_initialization(self):
         """Test that a Ball initializes with correct properties"""
         ball = Ball(self.mass, self.initial_angle, self.pivot)
@@ -81,8 +112,30 @@ class TestBall(unittest.TestCase):
         expected_x = self.pivot[0] + self.params.rod_length * math.sin(angle)
         expected_y = self.pivot[1] + self.params.rod_length * math.cos(angle)
 
-        self.assertAlmostEqual(pos[0], expected_x, places=5)
-        self.assertAlmostEqual(pos[1], expected_y, places=5)
+        self.close(pos[0], expected_x)
+        self.close(pos[1], expected_y)
+
+    def test_cached_position_follows_update(self):
+        """Test that x and y are refreshed whenever the ball moves"""
+        ball = Ball(self.mass, math.pi / 6, self.pivot)
+        ball.update(*self.params.physics())
+
+        expected_x = self.pivot[0] + self.params.rod_length * math.sin(ball.angle)
+        expected_y = self.pivot[1] + self.params.rod_length * math.cos(ball.angle)
+        self.assertAlmostEqual(ball.x, expected_x, places=4)
+        self.assertAlmostEqual(ball.y, expected_y, places=4)
+        self.assertEqual(ball.get_position(), (ball.x, ball.y))
+
+    def test_update_positions_with_given_rod_length(self):
+        """Test that update() places the ball using its L argument, not params"""
+        ball = Ball(self.mass, 0.5, self.pivot)
+        dt, g, _, damping = self.params.physics()
+        L = self.params.rod_length + 100
+
+        ball.update(dt, g, L, damping)
+
+        self.close(ball.x, self.pivot[0] + L * math.sin(ball.angle), tol=5e-4)
+        self.close(ball.y, self.pivot[1] + L * math.cos(ball.angle), tol=5e-4)
 
     def test_update_changes_angle(self):
         """Test that update() changes the ball's angle when angular velocity is non-zero"""
@@ -90,7 +143,7 @@ class TestBall(unittest.TestCase):
         ball.angular_velocity = 0.1
         initial_angle = ball.angle
 
-        ball.update(self.params.time_step)
+        ball.update(*self.params.physics())
 
         # Angle should have changed
         self.assertNotEqual(ball.angle, initial_angle)
@@ -100,48 +153,263 @@ class TestBall(unittest.TestCase):
         angle = math.pi / 6
         ball = Ball(self.mass, angle, self.pivot)
 
-        ball.update(self.params.time_step)
+        ball.update(*self.params.physics())
 
         # Expected acceleration: -g * sin(angle) / rod_length
         expected_accel = -self.params.gravity * math.sin(angle) / self.params.rod_length
         self.assertAlmostEqual(ball.angular_acceleration, expected_accel, places=5)
 
+    def test_pendulum_acceleration_at_max_angle(self):
+        """Test that acceleration uses the exact sine up to the slider's pi/2 limit"""
+        angle = math.pi / 2
+        ball = Ball(self.mass, angle, self.pivot)
+
+        ball.update(*self.params.physics())
+
+        expected_accel = -self.params.gravity * math.sin(angle) / self.params.rod_length
+        self.assertAlmostEqual(ball.angular_acceleration, expected_accel, places=5)
+
     def test_damping_effect(self):
         """Test that damping affects angular velocity"""
         ball = Ball(self.mass, math.pi / 6, self.pivot)
         ball.angular_velocity = 1.0
 
         # With damping = 1.0, velocity should be preserved
-        ball.update(self.params.time_step)
+        ball.update(*self.params.physics())
         self.assertGreater(ball.angular_velocity, 0.99)  # Should be close to original
 
+    def test_damping_below_one_slows_ball(self):
+        """Test that damping < 1 scales the angular velocity each update"""
+        damped = Ball(self.mass, 0, self.pivot)
+        free = Ball(self.mass, 0, self.pivot)
+        damped.angular_velocity = free.angular_velocity = 1.0
+        dt, g, L, _ = self.params.physics()
+
+        damped.update(dt, g, L, 0.9)
+        free.update(dt, g, L, 1.0)
+
+        self.close(damped.angular_velocity, 0.9 * free.angular_velocity)
+
     def test_energy_conservation_at_equilibrium(self):
         """Test that a ball at rest stays at rest"""
         ball = Ball(self.mass, 0, self.pivot)
         ball.angular_velocity = 0
 
         for _ in range(10):
-            ball.update(self.params.time_step)
+            ball.update(*self.params.physics())
 
         # At equilibrium with no initial velocity, ball should remain at equilibrium
-        self.assertAlmostEqual(ball.angle, 0, places=3)
-        self.assertAlmostEqual(ball.angular_velocity, 0, places=3)
+        self.close(ball.angle, 0, tol=5e-4)
+        self.close(ball.angular_velocity, 0, tol=5e-4)
+
+
+class TestCradleState(unittest.TestCase):
+    """Test cases for the vectorized CradleState and step()"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.params = SimulationParams()
+
+    def test_iteration_yields_views(self):
+        """Test that iterating a state yields views that write through to its arrays"""
+        state = CradleState.empty(3)
+        state.masses[:] = [1.0, 2.0, 3.0]
+
+        balls = list(state)
+        self.assertEqual([ball._index for ball in balls], [0, 1, 2])
+        self.assertTrue(all(ball._state is state for ball in balls))
+        self.assertEqual([ball.mass for ball in balls], [1.0, 2.0, 3.0])
+
+        balls[2].angular_velocity = 0.5
+        self.assertAlmostEqual(state.omegas[2], 0.5)
+        # Views are built lazily, one per step of the iteration
+        self.assertTrue(inspect.isgenerator(iter(state)))
+
+    def test_step_matches_ball_update(self):
+        """Test that the vectorized step matches the per-ball update"""
+        angles = [0.0, 0.3, -0.2, math.pi / 4]
+        state = CradleState.empty(len(angles))
+        state.angles[:] = angles
+        state.omegas[:] = [0.0, 0.1, -0.4, 0.2]
+        get_positions(state, self.params.rod_length)  # refresh the cached sines
+
+        with patch('NewtonCradle.params', self.params):
+            balls = []
+            for i, angle in enumerate(angles):
+                ball = Ball(1.0, angle, (i * 40, 100))
+                ball.angular_velocity = state.omegas[i]
+                balls.append(ball)
+
+            for _ in range(50):
+                step(state, self.params.time_step, self.params.gravity,
+                     self.params.rod_length, self.params.damping)
+                for ball in balls:
+                    ball.update(*self.params.physics())
+
+        for i, ball in enumerate(balls):
+            self.assertAlmostEqual(state.angles[i], ball.angle, places=5)
+            self.assertAlmostEqual(state.omegas[i], ball.angular_velocity, places=5)
+            self.assertAlmostEqual(state[i].angular_acceleration, ball.angular_acceleration, places=5)
+
+    def test_step_keeps_cached_sines_current(self):
+        """Test that step leaves sin(angle) cached for the next step"""
+        with patch('NewtonCradle.params', self.params):
+            state = initialize_simulation()
+            for _ in range(10):
+                step(state, self.params.time_step, self.params.gravity,
+                     self.params.rod_length, self.params.damping)
+
+        np.testing.assert_allclose(state.sins, np.sin(state.angles))
+
+    def test_parallel_kernel_matches_generic(self):
+        """Test that the threaded kernel for large cradles matches the generic one"""
+        import physics_kernels
+
+        n = physics_kernels.PARALLEL_MIN_BALLS + 8
+        self.assertIs(physics_kernels.advance_for(n), physics_kernels.advance_parallel)
+        states = []
+        for _ in range(2):
+            state = CradleState.empty(n)
+            state.pivots_x[:] = np.arange(n) * 30
+            state.angles[-1] = math.pi / 4
+            get_positions(state, self.params.rod_length)
+            states.append(state)
+        parallel, generic = states
+
+        args = (self.params.time_step, self.params.gravity, float(self.params.rod_length),
+                self.params.damping, 15.0, 1.0)
+        for _ in range(200):
+            physics_kernels.advance_parallel(parallel.angles, parallel.omegas, parallel.alphas,
+                                             parallel.sins, parallel.pivots_x, parallel.pivots_y,
+                                             parallel.xs, parallel.ys, *args)
+            physics_kernels.advance(generic.angles, generic.omegas, generic.alphas, generic.sins,
+                                    generic.pivots_x, generic.pivots_y, generic.xs, generic.ys, *args)
+
+        np.testing.assert_allclose(parallel.angles, generic.angles)
+        np.testing.assert_allclose(parallel.omegas, generic.omegas)
+
+    def test_get_positions(self):
+        """Test that positions are computed for every ball at once"""
+        state = CradleState.empty(2)
+        state.angles[:] = [0.0, math.pi / 6]
+        state.pivots_x[:] = [100, 140]
+        state.pivots_y[:] = [100, 100]
+
+        xs, ys = get_positions(state, 200)
+
+        np.testing.assert_allclose(xs, [100, 140 + 200 * math.sin(math.pi / 6)])
+        np.testing.assert_allclose(ys, [300, 100 + 200 * math.cos(math.pi / 6)])
+
+    def test_ball_view_writes_through(self):
+        """Test that a Ball obtained from a state reads and writes the arrays"""
+        state = CradleState.empty(3)
+        ball = state[-1]
+        ball.angle = 0.5
+        ball.angular_velocity = -0.25
+
+        self.assertEqual(state.angles[2], 0.5)
+        self.assertEqual(state.omegas[2], -0.25)
+        self.assertEqual(len(state), 3)
+        with self.assertRaises(IndexError):
+            state[3]
+
+    def test_resolve_collisions_on_state(self):
+        """Test that resolve_collisions works directly on a CradleState"""
+        state = CradleState.empty(2)
+        state.pivots_x[:] = [100, 140]
+        state.omegas[:] = [0, -0.1]
+
+        with patch('NewtonCradle.params', self.params):
+            resolve_collisions(state)
+
+        np.testing.assert_allclose(state.omegas, [-0.1, 0])
+
+    def test_resolve_collisions_after_writing_angles(self):
+        """Test that resolve_collisions sees angles written straight to the arrays"""
+        state = CradleState.empty(2)
+        state.pivots_x[:] = [100, 200]
+        state.angles[:] = [0, -0.35]  # swings the right ball into the left one
+        state.omegas[:] = [0, -1]
+
+        with patch('NewtonCradle.params', self.params):
+            resolve_collisions(state)
+
+        np.testing.assert_allclose(state.omegas, [-1, 0])
+
+    def test_advance_matches_step_and_resolve(self):
+        """Test that the fused kernel equals a step followed by collision resolution"""
+        with patch('NewtonCradle.params', self.params):
+            fused = initialize_simulation()
+            split = initialize_simulation()
+
+            for _ in range(200):
+                advance_state(fused, self.params.time_step, self.params.gravity,
+                              self.params.rod_length, self.params.damping, self.params.ball_radius)
+                step(split, self.params.time_step, self.params.gravity,
+                     self.params.rod_length, self.params.damping)
+                resolve_collisions(split)
+
+        np.testing.assert_allclose(fused.angles, split.angles)
+        np.testing.assert_allclose(fused.omegas, split.omegas)
+        # The fused step leaves this frame's positions cached for drawing
+        xs, ys = fused.xs.copy(), fused.ys.copy()
+        get_positions(fused, self.params.rod_length)
+        np.testing.assert_allclose(xs, fused.xs)
+        np.testing.assert_allclose(ys, fused.ys)
+
+    def test_advance_several_steps_matches_single_steps(self):
+        """Test that advancing n steps in one call equals n separate calls"""
+        with patch('NewtonCradle.params', self.params):
+            batched = initialize_simulation()
+            single = initialize_simulation()
+        args = (self.params.time_step / 4, self.params.gravity, self.params.rod_length,
+                self.params.damping, self.params.ball_radius)
+
+        advance_state(batched, *args, steps=400)
+        for _ in range(400):
+            advance_state(single, *args)
+
+        # Separately compiled fastmath kernels may order the arithmetic
+        # differently, so only near-equality is required.
+        np.testing.assert_allclose(batched.angles, single.angles, rtol=1e-5, atol=1e-6)
+        np.testing.assert_allclose(batched.omegas, single.omegas, rtol=1e-5, atol=1e-6)
+        np.testing.assert_allclose(batched.xs, single.xs, rtol=1e-5)
+
+    @unittest.skipUnless(__debug__, "asserts are stripped under -O")
+    def test_advance_rejects_non_finite_state(self):
+        """Test that a NaN or infinity in the state is caught after the kernel call"""
+        with patch('NewtonCradle.params', self.params):
+            state = initialize_simulation()
+        state.omegas[0] = np.nan
+        with self.assertRaises(AssertionError):
+            advance_state(state, self.params.time_step, self.params.gravity,
+                          self.params.rod_length, self.params.damping, self.params.ball_radius)
+        # Infinities are caught as well
+        with patch('NewtonCradle.params', self.params):
+            state = initialize_simulation()
+        state.omegas[0], state.omegas[1] = np.inf, -np.inf
+        with self.assertRaises(AssertionError):
+            advance_state(state, self.params.time_step, self.params.gravity,
+                          self.params.rod_length, self.params.damping, self.params.ball_radius)
 
 
 class TestButton(unittest.TestCase):
     """Test cases for the Button class"""
 
+    @classmethod
+    def setUpClass(cls):
+        """Initialize pygame once for the whole class"""
+        pygame.init()
+
     def setUp(self):
         """Set up test fixtures"""
-        pygame.init()
         self.button = Button(50, 50, 100, 40, "Test Button", (100, 100, 200))
 
     def test_button_initialization(self):
         """Test that Button initializes with correct properties"""
-        self.assertEqual(self.button.rect.x, 50)
-        self.assertEqual(self.button.rect.y, 50)
-        self.assertEqual(self.button.rect.width, 100)
-        self.assertEqual(self.button.rect.height, 40)
+        x, y = self.button.rect.topleft
+        w, h = self.button.rect.size
+        self.assertEqual((x, y, w, h), (50, 50, 100, 40))
         self.assertEqual(self.button.text, "Test Button")
         self.assertEqual(self.button.color, (100, 100, 200))
 
@@ -153,46 +421,56 @@ class TestButton(unittest.TestCase):
 
     def test_is_clicked_with_click_event(self):
         """Test that is_clicked returns True when button is clicked"""
-        # Create a mock mouse button down event at button position
-        event = Mock()
-        event.type = pygame.MOUSEBUTTONDOWN
-        event.button = 1  # Left mouse button
-        event.pos = (75, 70)  # Inside button
+        # Left mouse button down inside the button
+        event = mk_event(pygame.MOUSEBUTTONDOWN, pos=(75, 70))
 
-        self.assertTrue(self.button.is_clicked(event))
+        self.assertTrue(self.button.is_clicked(*event))
 
     def test_is_clicked_outside_button(self):
         """Test that is_clicked returns False when clicking outside button"""
-        event = Mock()
-        event.type = pygame.MOUSEBUTTONDOWN
-        event.button = 1
-        event.pos = (200, 200)  # Outside button
+        event = mk_event(pygame.MOUSEBUTTONDOWN, pos=(200, 200))  # Outside button
 
-        self.assertFalse(self.button.is_clicked(event))
+        self.assertFalse(self.button.is_clicked(*event))
 
     def test_is_clicked_with_wrong_event_type(self):
         """Test that is_clicked returns False for non-click events"""
-        event = Mock()
-        event.type = pygame.MOUSEMOTION
-        event.button = 1
-        event.pos = (75, 70)
+        event = mk_event(pygame.MOUSEMOTION, pos=(75, 70))
 
-        self.assertFalse(self.button.is_clicked(event))
+        self.assertFalse(self.button.is_clicked(*event))
+
+    def test_is_clicked_follows_moved_rect(self):
+        """Test that clicks register where the button is after its rect moves"""
+        self.button.rect.x = 300
+
+        self.assertTrue(self.button.is_clicked(*mk_event(pygame.MOUSEBUTTONDOWN, pos=(310, 60))))
+        self.assertFalse(self.button.is_clicked(*mk_event(pygame.MOUSEBUTTONDOWN, pos=(60, 60))))
+
+    def test_is_clicked_edges_match_rect(self):
+        """Test that clicks on the border agree with Rect.collidepoint"""
+        rect = self.button.rect
+        for pos in [rect.topleft, (rect.right - 1, rect.bottom - 1),
+                    (rect.right, rect.y), (rect.x, rect.bottom), (rect.x - 1, rect.y)]:
+            event = mk_event(pygame.MOUSEBUTTONDOWN, pos=pos)
+            self.assertEqual(self.button.is_clicked(*event), bool(rect.collidepoint(pos)), pos)
 
 
 class TestSlider(unittest.TestCase):
     """Test cases for the Slider class"""
 
+    @classmethod
+    def setUpClass(cls):
+        """Initialize pygame once for the whole class"""
+        pygame.init()
+
     def setUp(self):
         """Set up test fixtures"""
-        pygame.init()
         self.slider = Slider(50, 50, 300, 10, 0, 100, 50, "Test Slider", step=1)
 
     def test_slider_initialization(self):
         """Test that Slider initializes with correct properties"""
-        self.assertEqual(self.slider.rect.x, 50)
-        self.assertEqual(self.slider.rect.y, 50)
-        self.assertEqual(self.slider.rect.width, 300)
+        x, y = self.slider.rect.topleft
+        w, h = self.slider.rect.size
+        self.assertEqual((x, y, w, h), (50, 50, 300, 10))
         self.assertEqual(self.slider.min_val, 0)
         self.assertEqual(self.slider.max_val, 100)
         self.assertEqual(self.slider.value, 50)
@@ -208,133 +486,206 @@ class TestSlider(unittest.TestCase):
 
     def test_handle_event_mouse_down(self):
         """Test slider activation on mouse down"""
-        event = Mock()
-        event.type = pygame.MOUSEBUTTONDOWN
-        event.button = 1
         # Position on slider handle (middle of slider)
-        handle_x = self.slider.rect.x + (self.slider.value - self.slider.min_val) / \
-                   (self.slider.max_val - self.slider.min_val) * self.slider.rect.width
-        handle_y = self.slider.rect.y + self.slider.rect.height // 2
-        event.pos = (handle_x, handle_y)
-
-        self.slider.handle_event(event)
+        x, y = self.slider.rect.topleft
+        w, h = self.slider.rect.size
+        handle_x = x + (self.slider.value - self.slider.min_val) / \
+                   (self.slider.max_val - self.slider.min_val) * w
+        handle_y = y + h // 2
+        event = mk_event(pygame.MOUSEBUTTONDOWN, pos=(handle_x, handle_y))
+
+        self.slider.handle_event(*event)
         self.assertTrue(self.slider.active)
 
     def test_handle_event_mouse_up(self):
         """Test slider deactivation on mouse up"""
         self.slider.active = True
-        event = Mock()
-        event.type = pygame.MOUSEBUTTONUP
-        event.button = 1
+        event = mk_event(pygame.MOUSEBUTTONUP)
 
-        self.slider.handle_event(event)
+        self.slider.handle_event(*event)
         self.assertFalse(self.slider.active)
 
     def test_handle_event_mouse_motion(self):
         """Test slider value update on mouse motion when active"""
         self.slider.active = True
-        event = Mock()
-        event.type = pygame.MOUSEMOTION
         # Move to 75% of the slider
-        event.pos = (self.slider.rect.x + int(0.75 * self.slider.rect.width),
-                     self.slider.rect.y)
+        event = mk_event(pygame.MOUSEMOTION,
+                         pos=(self.slider.rect.x + int(0.75 * self.slider.rect.width),
+                              self.slider.rect.y))
 
-        result = self.slider.handle_event(event)
+        result = self.slider.handle_event(*event)
         self.assertTrue(result)
         # Value should be approximately 75 (75% of 0-100 range)
         self.assertAlmostEqual(self.slider.value, 75, delta=2)
 
+    def test_handle_event_motion_without_change(self):
+        """Test that motion leaving the snapped value unchanged reports no change"""
+        self.slider.active = True
+        # 1 px right of the handle is still 50 after snapping to the step.
+        event = mk_event(pygame.MOUSEMOTION, pos=(self.slider.rect.x + 151, self.slider.rect.y))
+
+        self.assertFalse(self.slider.handle_event(*event))
+        self.assertEqual(self.slider.value, 50)
+
+        # Dragging past the end clamps to max_val once, then stays there.
+        event = mk_event(pygame.MOUSEMOTION, pos=(self.slider.rect.right + 50, self.slider.rect.y))
+        self.assertTrue(self.slider.handle_event(*event))
+        self.assertFalse(self.slider.handle_event(*event))
+        self.assertEqual(self.slider.value, 100)
+
     def test_slider_step_quantization(self):
         """Test that slider values are quantized to step size"""
         slider = Slider(50, 50, 300, 10, 0, 10, 5, "Test", step=0.5)
         slider.active = True
 
-        event = Mock()
-        event.type = pygame.MOUSEMOTION
         # Set to a position that would give 5.23, should round to 5.5
-        event.pos = (slider.rect.x + int(0.523 * slider.rect.width), slider.rect.y)
+        event = mk_event(pygame.MOUSEMOTION,
+                         pos=(slider.rect.x + int(0.523 * slider.rect.width), slider.rect.y))
 
-        slider.handle_event(event)
+        slider.handle_event(*event)
         # Value should be a multiple of 0.5
         self.assertEqual(slider.value % 0.5, 0)
 
 
-class TestInitializeSimulation(unittest.TestCase):
+    def test_handle_rect_follows_value(self):
+        """Test that the cached handle rect is refreshed when the value changes"""
+        rect = self.slider.handle_rect()
+        self.assertIs(self.slider.handle_rect(), rect)
+        self.assertEqual(rect.centerx, 200)
+
+        self.slider.value = 75
+        self.assertEqual(self.slider.handle_rect().centerx, 275)
+
+    def test_handle_rect_follows_moved_track(self):
+        """Test that a moved slider draws and drags its handle on the new track"""
+        self.slider.handle_rect()
+        self.slider.rect.x += 100
+
+        self.assertEqual(self.slider.handle_rect().centerx, 300)
+        self.assertTrue(self.slider.handle_area().contains(self.slider.handle_rect()))
+
+        # Drag positions are measured from the new track position too.
+        self.slider.active = True
+        event = mk_event(pygame.MOUSEMOTION,
+                         pos=(self.slider.rect.x + int(0.75 * self.slider.rect.width), self.slider.rect.y))
+        self.slider.handle_event(*event)
+        self.assertEqual(self.slider.value, 75)
+
+    def test_step_snapping_at_half_way(self):
+        """Test that a value half-way between steps snaps like value / step"""
+        slider = Slider(400, 360, 300, 10, 1, 100, 50, "Gravity", 0.1)
+        slider.active = True
+        # 235 px along the track is 78.55.
+        event = mk_event(pygame.MOUSEMOTION, pos=(slider.rect.x + 235, slider.rect.y))
+
+        slider.handle_event(*event)
+        self.assertAlmostEqual(slider.value, 78.5)
+
+    def test_label_surface_cached_until_value_changes(self):
+        """Test that the slider label is only re-rendered when its value changes"""
+        surface = pygame.Surface((400, 100))
+        self.slider.draw(surface)
+        first = self.slider._label_surf
+
+        self.slider.draw(surface)
+        self.assertIs(self.slider._label_surf, first)
+
+        self.slider.value = 60
+        self.slider.draw(surface)
+        self.assertIsNot(self.slider._label_surf, first)
+
+class ParamsFixture:
+    """Installs a real SimulationParams as NewtonCradle.params for each test"""
+
+    def setUp(self):
+        """Install a real SimulationParams as the module-level params"""
+        self._saved_params = NewtonCradle.params
+        self.params = NewtonCradle.params = SimulationParams()
+
+    def tearDown(self):
+        """Restore the original params"""
+        NewtonCradle.params = self._saved_params
+
+
+class TestInitializeSimulation(ParamsFixture, unittest.TestCase):
     """Test cases for the initialize_simulation function"""
 
-    @patch('NewtonCradle.params')
-    def test_correct_number_of_balls(self, mock_params):
+    def test_correct_number_of_balls(self):
         """Test that initialize_simulation creates the correct number of balls"""
-        mock_params.num_balls = 5
-        mock_params.ball_radius = 20
-        mock_params.ball_mass = 1.0
-        mock_params.initial_angle = math.pi / 4
+        self.params.num_balls = 5
+        self.params.ball_radius = 20
+        self.params.ball_mass = 1.0
+        self.params.initial_angle = math.pi / 4
 
         balls = initialize_simulation()
         self.assertEqual(len(balls), 5)
 
-    @patch('NewtonCradle.params')
-    def test_rightmost_ball_raised(self, mock_params):
+    def test_rightmost_ball_raised(self):
         """Test that the rightmost ball is raised to initial_angle"""
-        mock_params.num_balls = 5
-        mock_params.ball_radius = 20
-        mock_params.ball_mass = 1.0
-        mock_params.initial_angle = math.pi / 4
+        self.params.num_balls = 5
+        self.params.ball_radius = 20
+        self.params.ball_mass = 1.0
+        self.params.initial_angle = math.pi / 4
 
         balls = initialize_simulation()
         # Rightmost ball (last in list) should have initial angle
         self.assertAlmostEqual(balls[-1].angle, math.pi / 4, places=5)
 
-    @patch('NewtonCradle.params')
-    def test_other_balls_at_equilibrium(self, mock_params):
+    def test_other_balls_at_equilibrium(self):
         """Test that all balls except rightmost start at equilibrium"""
-        mock_params.num_balls = 5
-        mock_params.ball_radius = 20
-        mock_params.ball_mass = 1.0
-        mock_params.initial_angle = math.pi / 4
+        self.params.num_balls = 5
+        self.params.ball_radius = 20
+        self.params.ball_mass = 1.0
+        self.params.initial_angle = math.pi / 4
 
         balls = initialize_simulation()
         # All balls except the last should have angle = 0
         for i in range(len(balls) - 1):
             self.assertEqual(balls[i].angle, 0)
 
-    @patch('NewtonCradle.params')
-    def test_balls_have_correct_mass(self, mock_params):
+    def test_balls_have_correct_mass(self):
         """Test that all balls have the correct mass"""
-        mock_params.num_balls = 3
-        mock_params.ball_radius = 20
-        mock_params.ball_mass = 2.5
-        mock_params.initial_angle = math.pi / 4
+        self.params.num_balls = 3
+        self.params.ball_radius = 20
+        self.params.ball_mass = 2.5
+        self.params.initial_angle = math.pi / 4
 
         balls = initialize_simulation()
         for ball in balls:
             self.assertEqual(ball.mass, 2.5)
 
-    @patch('NewtonCradle.params')
-    def test_ball_spacing(self, mock_params):
+    def test_ball_spacing(self):
         """Test that balls are spaced correctly"""
-        mock_params.num_balls = 3
-        mock_params.ball_radius = 20
-        mock_params.ball_mass = 1.0
-        mock_params.initial_angle = 0
+        self.params.num_balls = 3
+        self.params.ball_radius = 20
+        self.params.ball_mass = 1.0
+        self.params.initial_angle = 0
 
         balls = initialize_simulation()
         # All balls at equilibrium, check horizontal spacing
-        expected_spacing = 2 * mock_params.ball_radius
+        expected_spacing = 2 * self.params.ball_radius
 
         for i in range(len(balls) - 1):
             spacing = balls[i + 1].pivot[0] - balls[i].pivot[0]
             self.assertAlmostEqual(spacing, expected_spacing, places=5)
 
+    def test_positions_ready_after_initialization(self):
+        """Test that ball centers and sines are computed before the first frame"""
+        state = initialize_simulation()
+
+        L = self.params.rod_length
+        np.testing.assert_allclose(state.sins, np.sin(state.angles))
+        np.testing.assert_allclose(state.xs, state.pivots_x + L * np.sin(state.angles), rtol=1e-6)
+        np.testing.assert_allclose(state.ys, state.pivots_y + L * np.cos(state.angles), rtol=1e-6)
 
-class TestResolveCollisions(unittest.TestCase):
+
+class TestResolveCollisions(ParamsFixture, unittest.TestCase):
     """Test cases for the resolve_collisions function"""
 
-    @patch('NewtonCradle.params')
-    def test_velocity_swap_on_collision(self, mock_params):
+    def test_velocity_swap_on_collision(self):
         """Test that velocities are swapped when balls collide"""
-        mock_params.ball_radius = 20
-        mock_params.rod_length = 200
+        self.params.ball_radius = 20
+        self.params.rod_length = 200
 
         # Create two balls close together with different velocities
         ball1 = Ball(1.0, 0, (100, 100))
@@ -350,11 +701,10 @@ class TestResolveCollisions(unittest.TestCase):
         self.assertAlmostEqual(ball1.angular_velocity, -0.1, places=5)
         self.assertAlmostEqual(ball2.angular_velocity, 0, places=5)
 
-    @patch('NewtonCradle.params')
-    def test_no_collision_when_separated(self, mock_params):
+    def test_no_collision_when_separated(self):
         """Test that no collision occurs when balls are separated"""
-        mock_params.ball_radius = 20
-        mock_params.rod_length = 200
+        self.params.ball_radius = 20
+        self.params.rod_length = 200
 
         # Create two balls far apart
         ball1 = Ball(1.0, 0, (100, 100))
@@ -372,11 +722,10 @@ class TestResolveCollisions(unittest.TestCase):
         self.assertAlmostEqual(ball1.angular_velocity, initial_v1, places=5)
         self.assertAlmostEqual(ball2.angular_velocity, initial_v2, places=5)
 
-    @patch('NewtonCradle.params')
-    def test_no_collision_when_moving_apart(self, mock_params):
+    def test_no_collision_when_moving_apart(self):
         """Test that no collision occurs when balls are moving apart"""
-        mock_params.ball_radius = 20
-        mock_params.rod_length = 200
+        self.params.ball_radius = 20
+        self.params.rod_length = 200
 
         ball1 = Ball(1.0, 0, (100, 100))
         ball2 = Ball(1.0, 0, (140, 100))
@@ -394,6 +743,110 @@ class TestResolveCollisions(unittest.TestCase):
         self.assertAlmostEqual(ball1.angular_velocity, initial_v1, places=5)
         self.assertAlmostEqual(ball2.angular_velocity, initial_v2, places=5)
 
+    def test_separated_balls_skip_kernel(self):
+        """Test that a list of balls with no contacts returns before the kernel"""
+        self.params.ball_radius = 20
+        balls = [Ball(1.0, 0, (100, 100)), Ball(1.0, 0, (141, 100))]  # just out of reach
+        balls[1].angular_velocity = -0.1
+
+        with patch('NewtonCradle.collision_kernel') as kernel:
+            resolve_collisions(balls)
+
+        kernel.assert_not_called()
+        self.assertAlmostEqual(balls[1].angular_velocity, -0.1, places=5)
+
+    def test_impulse_crosses_touching_chain(self):
+        """Test that a hit passes through a row of touching balls in one call"""
+        state = CradleState.empty(5)
+        state.pivots_x[:] = np.arange(5) * 2 * self.params.ball_radius
+        state.omegas[-1] = -0.5
+
+        resolve_collisions(state)
+
+        # A single pass of pairwise swaps would only move it to the fourth ball
+        np.testing.assert_array_equal(state.omegas, [-0.5, 0, 0, 0, 0])
+
+    def test_matches_iterative_reference(self):
+        """Test that the single sweep matches the original iterative resolver"""
+        def reference(xs, omegas, radius, tolerance=1.0, max_iter=10):
+            omegas = list(omegas)
+            for _ in range(max_iter):
+                collision_found = False
+                for i in range(len(xs) - 1, 0, -1):
+                    if xs[i] - xs[i - 1] < 2 * radius + tolerance and omegas[i] < omegas[i - 1]:
+                        omegas[i - 1], omegas[i] = omegas[i], omegas[i - 1]
+                        collision_found = True
+                if not collision_found:
+                    break
+            return omegas
+
+        rng = random.Random(1234)
+        for _ in range(500):
+            n = rng.randint(2, 10)
+            state = CradleState.empty(n)
+            state.pivots_x[:] = np.arange(n) * 2 * self.params.ball_radius
+            state.angles[:] = [rng.uniform(-0.05, 0.05) for _ in range(n)]
+            state.omegas[:] = [rng.uniform(-1, 1) for _ in range(n)]
+            xs, _ = get_positions(state, self.params.rod_length)
+            expected = reference(xs.copy(), state.omegas, self.params.ball_radius)
+
+            resolve_collisions(state)
+
+            np.testing.assert_array_equal(state.omegas, expected)
+
+class TestDrawing(unittest.TestCase):
+    """Test cases for the cached background and partial redraw helpers"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.params = SimulationParams()
+
+    def test_ui_overlay_is_transparent_outside_widgets(self):
+        """Test that the UI overlay only covers the areas it reports"""
+        overlay, rects = build_ui_overlay()
+        self.assertEqual(overlay.get_size(), (WIDTH, HEIGHT))
+        self.assertTrue(rects)
+        # Middle of the cradle area, away from every widget
+        self.assertEqual(overlay.get_at((WIDTH // 2, 250)).a, 0)
+        for rect in rects:
+            self.assertTrue(overlay.get_rect().contains(rect))
+
+    def test_ui_overlay_drawn_over_cradle(self):
+        """Test that slider tracks stay visible when a ball swings over them"""
+        self.params.rod_length = 300
+        self.params.ball_radius = 30
+        self.params.initial_angle = 0
+        surface = pygame.Surface((WIDTH, HEIGHT))
+        surface.fill((255, 255, 255))
+        with patch('NewtonCradle.params', self.params):
+            state = initialize_simulation()
+            draw(surface, state)
+        overlay, rects = build_ui_overlay()
+        surface.blits([(overlay, rect, rect) for rect in rects], False)
+
+        track = NewtonCradle.sliders[1].rect  # Ball Radius, crossed by the leftmost ball
+        point = (int(state.xs[0]), track.centery)
+        self.assertLess(abs(point[1] - state.ys[0]), self.params.ball_radius)
+        self.assertEqual(surface.get_at(point)[:3], (200, 200, 200))
+
+    def test_ball_sprite_cached_per_radius(self):
+        """Test that ball sprites are rendered once per radius"""
+        sprite = get_ball_sprite(20)
+        self.assertIs(get_ball_sprite(20), sprite)
+        self.assertEqual(sprite.get_size(), (42, 42))
+        self.assertIsNot(get_ball_sprite(25), sprite)
+
+    def test_draw_returns_area_around_balls(self):
+        """Test that draw reports a dirty rect containing every ball"""
+        surface = pygame.Surface((WIDTH, HEIGHT))
+        with patch('NewtonCradle.params', self.params):
+            state = initialize_simulation()
+            xs, ys = get_positions(state, self.params.rod_length)
+            dirty = draw(surface, state)
+
+        for x, y in zip(xs, ys):
+            self.assertTrue(dirty.collidepoint(x - self.params.ball_radius, y - self.params.ball_radius))
+            self.assertTrue(dirty.collidepoint(x + self.params.ball_radius, y + self.params.ball_radius))
 
 if __name__ == '__main__':
     # Run tests with verbose output